@@ -6,7 +6,23 @@ import subprocess
 import time
 import re
 import os
+import sys
+import queue
+import bisect
+import select
+import socket
+import math
+from array import array
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+try:
+    # Optional: C-implemented lock, cheaper than threading.Lock when uncontended
+    from fastrlock.rlock import FastRLock as StateLock
+except ImportError:
+    StateLock = threading.Lock
 
 # Localization ---------------------------------------------------------------
 
@@ -15,7 +31,27 @@ DEFAULT_LANG = "en"
 SUPPORTED_LANGS = ["en", "id"]  # extend as needed
 CURRENT_LANG = DEFAULT_LANG
 CURRENT_STRINGS: dict[str, str] = {}
-_DEFAULT_STRINGS_CACHE: dict[str, str] | None = None
+# Fully merged (default + localized) strings per language, loaded once
+_LANG_CACHE: dict[str, dict[str, str]] = {}
+
+# Keys guide rows: (key label, translation key for its action)
+KEY_ROWS = [
+    ("P", "KEY_ACTION_P"),
+    ("R", "KEY_ACTION_R"),
+    ("T", "KEY_ACTION_T"),
+    ("F", "KEY_ACTION_F"),
+    ("L", "KEY_ACTION_L"),
+    ("K", "KEY_ACTION_K"),
+    ("↑/↓", "KEY_ACTION_SCROLL"),
+    ("Q", "KEY_ACTION_Q"),
+]
+
+# Static UI text that only depends on the language; rebuilt by set_language
+_UI_STATIC: dict = {}
+
+# Table headers (not localized on purpose)
+METRICS_TABLE_HEADER = f"{'Metric':<14} {'Window (recent)':<18} {'Session (all)':<18}"
+TRACEROUTE_TABLE_HEADER = f"{'Hop':>3}  {'Host / IP':<40}  RTTs (ms)"
 
 
 def load_language_file(lang: str) -> dict:
@@ -33,49 +69,63 @@ def load_language_file(lang: str) -> dict:
         return strings
 
     with open(path, "r", encoding="utf-8") as f:
-        for raw_line in f:
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.lstrip()
-            if key:
-                strings[key] = value
+        pairs = (
+            line.split("=", 1)
+            for line in map(str.strip, f.read().splitlines())
+            if line and not line.startswith("#") and "=" in line
+        )
+        strings = {key.strip(): value.lstrip() for key, value in pairs if key.strip()}
+    return strings
+
+
+def get_language_strings(lang: str) -> dict:
+    """Return the merged strings for `lang`, reading its file only once.
+
+    Non-default languages are layered over the default language so missing
+    keys fall back to it.
+    """
+    strings = _LANG_CACHE.get(lang)
+    if strings is None:
+        strings = load_language_file(lang)
+        if lang != DEFAULT_LANG:
+            merged = dict(get_language_strings(DEFAULT_LANG))
+            merged.update(strings)
+            strings = merged
+        strings = _LANG_CACHE.setdefault(lang, strings)
     return strings
 
 
 def set_language(lang: str):
-    global CURRENT_LANG, CURRENT_STRINGS, _DEFAULT_STRINGS_CACHE
+    global CURRENT_LANG, CURRENT_STRINGS
     if lang not in SUPPORTED_LANGS:
         lang = DEFAULT_LANG
     CURRENT_LANG = lang
+    CURRENT_STRINGS = get_language_strings(lang)
 
-    if _DEFAULT_STRINGS_CACHE is None:
-        _DEFAULT_STRINGS_CACHE = load_language_file(DEFAULT_LANG)
+    build_ui_static()
 
-    if lang == DEFAULT_LANG:
-        CURRENT_STRINGS = dict(_DEFAULT_STRINGS_CACHE)
-    else:
-        localized = load_language_file(lang)
-        merged = dict(_DEFAULT_STRINGS_CACHE)
-        merged.update(localized)
-        CURRENT_STRINGS = merged
+
+def build_ui_static():
+    """Precompute the language-dependent static UI lines used by draw_ui."""
+    global _UI_STATIC
+    # Swap in a new dict so readers never see a half-built one
+    _UI_STATIC = {
+        "controls_header": f"{'Key':<8}{tr('KEYS_ACTION_HEADER')}",
+        "key_rows": [f"{key:<8}{tr(action)}" for key, action in KEY_ROWS],
+        "controls_hint": tr("CONTROLS_HINT"),
+    }
 
 
-def cycle_language():
-    """Cycle to the next available language in SUPPORTED_LANGS."""
-    global CURRENT_LANG
+def next_language(lang: str) -> str:
+    """Return the language after `lang` in SUPPORTED_LANGS (wrapping around)."""
     if not SUPPORTED_LANGS:
-        return
+        return lang
     try:
-        current_index = SUPPORTED_LANGS.index(CURRENT_LANG)
+        current_index = SUPPORTED_LANGS.index(lang)
     except ValueError:
         current_index = 0
     next_index = (current_index + 1) % len(SUPPORTED_LANGS)
-    set_language(SUPPORTED_LANGS[next_index])
+    return SUPPORTED_LANGS[next_index]
 
 
 def tr(key: str, **kwargs) -> str:
@@ -89,26 +139,190 @@ def tr(key: str, **kwargs) -> str:
 
 DEFAULT_TARGET_HOST = "www.youtube.com"
 PING_INTERVAL_SECONDS = 1.0
+PING_TIMEOUT_SECONDS = 5.0  # a reply later than this counts as lost
+ICMP_SEQ_MODULUS = 65536   # icmp_seq is 16 bits and wraps to 0
+JITTER_EWMA_GAIN = 1.0 / 16.0  # RFC 3550 interarrival jitter gain
 PING_HISTORY_LENGTH = 300  # how many samples to keep for graphs
 LOSS_HISTORY_LENGTH = 300
 
 MIN_WINDOW_SIZE = 10       # minimum number of recent checks
 DEFAULT_WINDOW_SIZE = 60   # default "time window" in checks (≈ seconds)
 
+# Main loop wakeup reasons (see MonitorState.events)
+WAKE_INPUT = "input"
+WAKE_REDRAW = "redraw"
+UI_IDLE_TIMEOUT_SECONDS = 1.0  # fallback wakeup when nothing else happens
+
+# Output parsing patterns (compiled once; used on every ping and UI redraw)
+_PING_TIME_RE = re.compile(r"time[=<]([\d.]+)\s*ms")
+_PING_SEQ_RE = re.compile(r"(?:icmp_)?seq[= ](\d+)")  # BusyBox prints "seq="
+_HOP_RE = re.compile(r"^\s*(\d+)\s+")
+_MS_RE = re.compile(r"([\d.]+)\s*ms")
+
+
+class RollingPingStats:
+    """Incrementally maintained aggregates over the last `maxlen` ping samples.
+
+    Each sample is either an RTT in ms or None for a lost packet. Prefix sums
+    give O(1) loss/avg for any trailing window, and monotonic deques
+    (the classic sliding-window min/max structure) give min/max. Because every
+    window ends at the newest sample, one set of structures serves windows of
+    any size up to `maxlen`.
+    """
+
+    __slots__ = (
+        "maxlen",
+        "count",
+        "_success_prefix",
+        "_rtt_prefix",
+        "_min_q",
+        "_max_q",
+    )
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.count = 0  # global index of the next sample
+
+        # Prefix aggregates: entry for global index i covers samples [0, i)
+        self._success_prefix = deque([0], maxlen=maxlen + 1)
+        self._rtt_prefix = deque([0.0], maxlen=maxlen + 1)
+
+        # (index, rtt) with increasing rtt (min) / decreasing rtt (max)
+        self._min_q = deque()
+        self._max_q = deque()
+
+    def append(self, rtt):
+        idx = self.count
+        self.count += 1
+        oldest = self.count - self.maxlen
+
+        if rtt is not None:
+            while self._min_q and self._min_q[-1][1] >= rtt:
+                self._min_q.pop()
+            self._min_q.append((idx, rtt))
+            while self._max_q and self._max_q[-1][1] <= rtt:
+                self._max_q.pop()
+            self._max_q.append((idx, rtt))
+
+        while self._min_q and self._min_q[0][0] < oldest:
+            self._min_q.popleft()
+        while self._max_q and self._max_q[0][0] < oldest:
+            self._max_q.popleft()
+
+        self._success_prefix.append(self._success_prefix[-1] + (rtt is not None))
+        self._rtt_prefix.append(self._rtt_prefix[-1] + (rtt or 0.0))
+
+    def windows(self, window_sizes) -> list:
+        """Return stats over the last `size` samples for each of `window_sizes`.
+
+        Same tuple layout as compute_multi_window_stats(). The end-of-history
+        prefix values and queue bounds are read once and shared by all windows.
+        """
+        count = self.count
+        base = count + 1 - len(self._success_prefix)
+        success_prefix = self._success_prefix
+        rtt_prefix = self._rtt_prefix
+        success_end = success_prefix[-1]
+        rtt_end = rtt_prefix[-1]
+        min_q = self._min_q
+        max_q = self._max_q
+
+        results = []
+        for window_size in window_sizes:
+            n = min(window_size, count, self.maxlen)
+            if n <= 0:
+                results.append((0.0, None, 0, 0, None, None))
+                continue
+
+            start = count - n
+            success = success_end - success_prefix[start - base]
+            lost = n - success
+            loss_pct = (lost / n) * 100.0
+            if success == 0:
+                results.append((loss_pct, None, n, lost, None, None))
+                continue
+
+            avg = (rtt_end - rtt_prefix[start - base]) / success
+
+            # First queue entry inside the window holds the window min / max
+            min_rtt = min_q[bisect.bisect_left(min_q, (start,))][1]
+            max_rtt = max_q[bisect.bisect_left(max_q, (start,))][1]
+
+            results.append((loss_pct, avg, n, lost, min_rtt, max_rtt))
+        return results
+
 
 class MonitorState:
-    def __init__(self, target_host: str):
-        self.lock = threading.Lock()
+    # Fixed attribute set: faster attribute access and no per-instance __dict__
+    __slots__ = (
+        "lock",
+        "ui_lock",
+        "target_host",
+        "target_addr",
+        "ping_proc",
+        "running",
+        "monitoring",
+        "show_traceroute_full",
+        "traceroute_scroll",
+        "traceroute_max_scroll",
+        "show_controls",
+        "dirty",
+        "total_sent",
+        "total_recv",
+        "last_ping_ms",
+        "total_success",
+        "success_rtt_sum",
+        "min_rtt_all",
+        "max_rtt_all",
+        "last_success_rtt_all",
+        "jitter_sum_all",
+        "jitter_count_all",
+        "jitter_ewma",
+        "_rtt_buf",
+        "_rtt_head",
+        "_rtt_len",
+        "loss_history",
+        "recent_stats",
+        "window_size",
+        "traceroute_lines",
+        "traceroute_event",
+        "traceroute_trigger",
+        "last_traceroute_error",
+        "traceroute_summary",
+        "last_traceroute_ts",
+        "_trace_cache",
+        "ui_pad",
+        "snapshot",
+        "snapshot_lock",
+        "changed",
+        "events",
+        "input_drained",
+        "language",
+        "language_version",
+        "executor",
+    )
+
+    def __init__(self, target_host: str, target_addr: str | None = None):
+        self.lock = StateLock()
+        # Guards read-modify-write of the UI-only fields below (window_size,
+        # traceroute scroll/view) so key handling never waits on the workers
+        self.ui_lock = StateLock()
 
-        # Target being monitored (host name or IP address)
+        # Target being monitored (host name or IP address), and the address
+        # ping/traceroute are run against (resolved once; see resolve_host)
         self.target_host = target_host
+        self.target_addr = target_addr or target_host
+        # Current ping child, so quit_monitor can kill it (see ping_worker)
+        self.ping_proc = None
 
         # Control flags
         self.running = True          # overall program running
         self.monitoring = True       # whether ping loop is active
         self.show_traceroute_full = False  # summary by default; F toggles details
         self.traceroute_scroll = 0         # scroll position for traceroute output
+        self.traceroute_max_scroll = 0     # largest useful scroll (set by draw_ui)
         self.show_controls = False         # whether to show the keys guide (hidden by default)
+        self.dirty = True                  # set whenever something on screen may have changed
 
         # Ping stats (overall)
         self.total_sent = 0
@@ -124,109 +338,361 @@ class MonitorState:
         self.jitter_sum_all = 0.0
         self.jitter_count_all = 0
 
+        # Recent jitter: RFC 3550 style smoothed |delta| between consecutive
+        # successful pings, updated once per sample (None until two successes)
+        self.jitter_ewma = None
+
         # History
-        self.ping_history = deque(maxlen=PING_HISTORY_LENGTH)  # float ms or None for loss
+        # Ping RTTs in a preallocated ring buffer (NaN == timeout / packet lost);
+        # _rtt_head is the next slot to write, _rtt_len the number of valid samples
+        self._rtt_buf = array("d", [math.nan]) * PING_HISTORY_LENGTH
+        self._rtt_head = 0
+        self._rtt_len = 0
         self.loss_history = deque(maxlen=LOSS_HISTORY_LENGTH)  # float % (overall, for reference)
+        self.recent_stats = RollingPingStats(PING_HISTORY_LENGTH)  # windowed aggregates of ping history
 
         # Window used for "recent" stats and graphs (in checks)
         self.window_size = DEFAULT_WINDOW_SIZE
 
         # Traceroute
-        self.traceroute_lines = []
-        self.traceroute_running = False
+        self.traceroute_lines = ()
+        self.traceroute_event = threading.Event()  # set while a traceroute runs
+        self.traceroute_trigger = threading.Event()  # set to request a run (see traceroute_worker_loop)
         self.last_traceroute_error = None
         self.traceroute_summary = None
         self.last_traceroute_ts = None
+        # (traceroute_lines object, formatted table rows) from the last snapshot.
+        # traceroute_worker always publishes a new tuple, so identity is the key.
+        self._trace_cache = (None, None)
+
+        # Off-screen pad draw_ui renders into (recreated on terminal resize)
+        self.ui_pad = None
+
+        # Latest published Snapshot for draw_ui (replaced, never mutated).
+        # Workers set `changed`; aggregator_worker then publishes a new one.
+        self.snapshot = None
+        self.snapshot_lock = threading.Lock()
+        self.changed = threading.Event()
+
+        # Main loop wakeups: WAKE_INPUT from input_worker, WAKE_REDRAW from
+        # publish_snapshot. input_drained is set once pending keys are read.
+        self.events = queue.SimpleQueue()
+        self.input_drained = threading.Event()
+        self.input_drained.set()
+
+        # Language chosen with L. The language file is loaded on `executor`;
+        # the main loop applies it when language_version changes.
+        self.language = CURRENT_LANG
+        self.language_version = 0
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+        publish_snapshot(self)
+
+    def append_sample(self, rtt):
+        """Append one ping sample (RTT in ms, or None for a lost packet)."""
+        self._rtt_buf[self._rtt_head] = math.nan if rtt is None else rtt
+        self._rtt_head = (self._rtt_head + 1) % PING_HISTORY_LENGTH
+        if self._rtt_len < PING_HISTORY_LENGTH:
+            self._rtt_len += 1
+
+    def recent_samples(self, count: int) -> array:
+        """Return a copy of the last `count` samples, oldest first (NaN == lost).
+
+        The window is copied with array slices: one when it is contiguous in
+        the buffer, two when it wraps around the end.
+        """
+        count = min(count, self._rtt_len)
+        if count <= 0:
+            return array("d")
+        buf = self._rtt_buf
+        head = self._rtt_head
+        start = head - count
+        if start >= 0:
+            return buf[start:head]
+        return buf[start:] + buf[:head]
+
+    def successful_samples(self, count: int) -> tuple:
+        """Return successful RTTs among the last `count` samples, oldest first."""
+        return tuple(v for v in self.recent_samples(count) if v == v)  # NaN != NaN
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Immutable copy of everything draw_ui needs, published by the writers.
+
+    Writers mutate MonitorState under state.lock and set state.changed;
+    aggregator_worker then calls publish_snapshot(). draw_ui reads
+    state.snapshot without locking.
+    """
 
-
-def run_ping(host: str, timeout: float = 5.0):
+    monitoring: bool
+    window_size: int
+    last_ping_ms: float | None
+    total_sent: int
+    total_recv: int
+    p90_win: float | None
+    p99_win: float | None
+    p90_all: float | None
+    p99_all: float | None
+    traceroute_table: tuple
+    traceroute_running: bool
+    traceroute_error: str | None
+    traceroute_summary: str | None
+    last_traceroute_ts: float | None
+    show_traceroute_full: bool
+    traceroute_scroll: int
+    show_controls: bool
+    total_success: int
+    success_rtt_sum: float
+    min_rtt_all: float | None
+    max_rtt_all: float | None
+    jitter_sum_all: float
+    jitter_count_all: int
+    jitter_ewma: float | None
+    target_host: str
+    recent_stats: tuple
+    short_stats: tuple
+
+
+def record_ping_result(state: MonitorState, success: bool, rtt):
+    """Fold one ping result into the overall stats and history.
+
+    Call with state.lock held.
     """
-    Run a single ping and return (success: bool, rtt_ms: float|None).
+    state.total_sent += 1
+    if success:
+        state.total_recv += 1
+        state.last_ping_ms = rtt
+
+        # Update overall RTT stats if we have a numeric RTT
+        if rtt is not None:
+            if state.total_success == 0:
+                state.min_rtt_all = rtt
+                state.max_rtt_all = rtt
+            else:
+                if state.min_rtt_all is None or rtt < state.min_rtt_all:
+                    state.min_rtt_all = rtt
+                if state.max_rtt_all is None or rtt > state.max_rtt_all:
+                    state.max_rtt_all = rtt
+
+            if state.last_success_rtt_all is not None:
+                delta = abs(rtt - state.last_success_rtt_all)
+                state.jitter_sum_all += delta
+                state.jitter_count_all += 1
+                if state.jitter_ewma is None:
+                    state.jitter_ewma = delta
+                else:
+                    state.jitter_ewma += (delta - state.jitter_ewma) * JITTER_EWMA_GAIN
+            state.last_success_rtt_all = rtt
+
+            state.success_rtt_sum += rtt
+            state.total_success += 1
+    else:
+        state.last_ping_ms = None
+
+    sent = state.total_sent
+    recv = state.total_recv
+    overall_loss_pct = 0.0 if sent == 0 else (1.0 - (recv / sent)) * 100.0
+
+    # For ping history, None == timeout / packet lost
+    state.append_sample(rtt if success else None)
+    state.recent_stats.append(rtt if success else None)
+    state.loss_history.append(overall_loss_pct)
+
+
+def start_ping_process(host: str, interval: float):
+    """Start one long-running ping that sends a packet every `interval` seconds.
+
+    Output is read as raw bytes from a non-blocking pipe by ping_worker.
     Uses very generic flags to work on macOS and most Unix systems.
     """
+    # -n -> numeric output; -i -> seconds between packets
+    proc = subprocess.Popen(
+        ["ping", "-n", "-i", f"{interval:g}", host],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        bufsize=0,
+    )
+    assert proc.stdout is not None
+    os.set_blocking(proc.stdout.fileno(), False)
+    return proc
+
+
+def stop_ping_process(proc):
     try:
-        # -c 1 -> send one packet; -n -> numeric output
-        proc = subprocess.run(
-            ["ping", "-n", "-c", "1", host],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
+        proc.kill()
+        proc.wait(timeout=5)
     except Exception:
-        return False, None
+        pass
+
+
+def split_output_lines(pending: bytes, chunk: bytes):
+    """Split raw subprocess output into complete text lines.
+
+    Returns (lines, pending) where `pending` holds a trailing partial line to
+    prepend to the next chunk. All complete lines of a chunk are decoded in
+    one call (a newline byte never falls inside a UTF-8 sequence).
+    """
+    data = pending + chunk
+    cut = data.rfind(b"\n") + 1
+    if not cut:
+        return [], data
+    text = data[:cut - 1].decode("utf-8", "replace")
+    return [line.rstrip("\r") for line in text.split("\n")], data[cut:]
+
 
-    if proc.returncode != 0:
-        return False, None
+def parse_ping_line(line: str):
+    """Parse one line of ping output.
 
-    # Look for "time=XX.X ms" in the output
-    match = re.search(r"time[=<]([\d.]+)\s*ms", proc.stdout)
-    if not match:
-        return True, None  # success but no RTT parsed
+    Returns (icmp_seq, rtt_ms) for a reply, (icmp_seq, None) for a reported
+    loss (e.g. macOS "Request timeout for icmp_seq 5" or "Destination Host
+    Unreachable"), (None, rtt_ms) for a reply without a sequence number, or
+    None for lines that are not about a single packet.
+    """
+    seq_match = _PING_SEQ_RE.search(line)
+    seq = int(seq_match.group(1)) if seq_match else None
 
+    # Look for "time=XX.X ms" in the reply
+    match = _PING_TIME_RE.search(line)
     try:
-        rtt = float(match.group(1))
+        rtt = float(match.group(1)) if match else None
     except ValueError:
         rtt = None
-    return True, rtt
-
+    if seq is None and rtt is None:
+        return None
+    return seq, rtt
 
-def ping_worker(state: MonitorState, interval: float):
-    while True:
-        with state.lock:
-            if not state.running:
-                break
-            monitoring = state.monitoring
-            host = state.target_host
 
-        if monitoring:
-            start_time = time.time()
-            success, rtt = run_ping(host)
-            elapsed = time.time() - start_time
+def account_ping_reply(next_seq, seq: int | None, rtt):
+    """Match one parsed reply against the next expected icmp_seq.
 
-            with state.lock:
-                state.total_sent += 1
-                if success:
-                    state.total_recv += 1
-                    state.last_ping_ms = rtt
-
-                    # Update overall RTT stats if we have a numeric RTT
-                    if rtt is not None:
-                        if state.total_success == 0:
-                            state.min_rtt_all = rtt
-                            state.max_rtt_all = rtt
-                        else:
-                            if state.min_rtt_all is None or rtt < state.min_rtt_all:
-                                state.min_rtt_all = rtt
-                            if state.max_rtt_all is None or rtt > state.max_rtt_all:
-                                state.max_rtt_all = rtt
-
-                        if state.last_success_rtt_all is not None:
-                            delta = abs(rtt - state.last_success_rtt_all)
-                            state.jitter_sum_all += delta
-                            state.jitter_count_all += 1
-                        state.last_success_rtt_all = rtt
-
-                        state.success_rtt_sum += rtt
-                        state.total_success += 1
-                else:
-                    state.last_ping_ms = None
+    Returns (results, next_seq): the (success, rtt) samples to record,
+    including a loss for every skipped sequence number, and the new
+    expected sequence number. icmp_seq wraps at ICMP_SEQ_MODULUS, so numbers
+    are compared modulo it; a reply more than half the range "ahead" is
+    really behind, i.e. a late reply for a packet already counted as lost.
+    A reply without a sequence number is recorded as a plain sample.
+    """
+    if seq is None:
+        return [(rtt is not None, rtt)], next_seq
+    if next_seq is None:
+        next_seq = seq
+    gap = (seq - next_seq) % ICMP_SEQ_MODULUS
+    if gap >= ICMP_SEQ_MODULUS // 2:
+        # Late reply for a packet already counted as lost
+        return [], next_seq
+    results = [(False, None)] * gap
+    results.append((rtt is not None, rtt))
+    return results, (seq + 1) % ICMP_SEQ_MODULUS
 
-                sent = state.total_sent
-                recv = state.total_recv
-                overall_loss_pct = 0.0 if sent == 0 else (1.0 - (recv / sent)) * 100.0
 
-                # For ping history, None == timeout / packet lost
-                state.ping_history.append(rtt if success else None)
-                state.loss_history.append(overall_loss_pct)
+def ping_worker(state: MonitorState, interval: float):
+    """Stream results from a single long-running ping process into state.
 
-            sleep_time = max(0.0, interval - elapsed)
-            time.sleep(sleep_time)
-        else:
-            # When paused, just check again shortly
-            time.sleep(0.1)
+    Replies are matched by icmp_seq: sequence numbers skipped in the output
+    were lost (Linux prints nothing for them). If ping stays silent for longer
+    than PING_TIMEOUT_SECONDS, one loss per interval is recorded so an outage
+    shows up while it is happening. The process is restarted on exit, pause,
+    or target change.
+    """
+    proc = None
+    proc_host = None
+    pending = b""
+    next_seq = None         # first icmp_seq not yet accounted for
+    last_sample_ts = 0.0
 
+    try:
+        while True:
+            with state.lock:
+                if not state.running:
+                    break
+                monitoring = state.monitoring
+                host = state.target_addr
+
+            if proc is not None and (not monitoring or host != proc_host):
+                stop_ping_process(proc)
+                proc = None
+
+            if not monitoring:
+                # When paused, just check again shortly
+                time.sleep(0.1)
+                continue
 
-def build_traceroute_summary(lines: list[str]) -> str | None:
+            if proc is None:
+                try:
+                    proc = start_ping_process(host, interval)
+                except Exception:
+                    # Same as a failed ping: count it as lost and retry later
+                    with state.lock:
+                        record_ping_result(state, False, None)
+                        state.changed.set()
+                    time.sleep(interval)
+                    continue
+                with state.lock:
+                    # quit_monitor kills state.ping_proc; if it already ran,
+                    # this process would be missed, so stop it here instead
+                    if not state.running:
+                        break
+                    state.ping_proc = proc
+                proc_host = host
+                pending = b""
+                next_seq = None
+                last_sample_ts = time.time()
+
+            fd = proc.stdout.fileno()
+            readable, _, _ = select.select([fd], [], [], interval)
+            results = []
+
+            if readable:
+                try:
+                    chunk = os.read(fd, 65536)
+                except BlockingIOError:
+                    chunk = None
+
+                if chunk == b"":
+                    # ping exited (e.g. host could not be resolved); count one
+                    # lost check and start a new process after an interval
+                    stop_ping_process(proc)
+                    proc = None
+                    with state.lock:
+                        if not state.running:
+                            # Killed by quit_monitor
+                            break
+                        record_ping_result(state, False, None)
+                        state.changed.set()
+                    time.sleep(interval)
+                    continue
+
+                if chunk:
+                    complete, pending = split_output_lines(pending, chunk)
+                    for line in complete:
+                        parsed = parse_ping_line(line)
+                        if parsed is None:
+                            continue
+                        seq, rtt = parsed
+                        matched, next_seq = account_ping_reply(next_seq, seq, rtt)
+                        results.extend(matched)
+
+            now = time.time()
+            if results:
+                last_sample_ts = now
+            elif now - last_sample_ts > interval + PING_TIMEOUT_SECONDS:
+                results.append((False, None))
+                last_sample_ts += interval
+                if next_seq is not None:
+                    next_seq = (next_seq + 1) % ICMP_SEQ_MODULUS
+
+            if results:
+                with state.lock:
+                    for success, rtt in results:
+                        record_ping_result(state, success, rtt)
+                    state.changed.set()
+    finally:
+        if proc is not None:
+            stop_ping_process(proc)
+
+
+def build_traceroute_summary(lines) -> str | None:
     """Build a compact summary of a completed traceroute.
 
     Extracts number of hops, max observed delay, and which hops had timeouts.
@@ -234,15 +700,12 @@ def build_traceroute_summary(lines: list[str]) -> str | None:
     if not lines:
         return None
 
-    hop_re = re.compile(r"^\s*(\d+)\s+")
-    ms_re = re.compile(r"([\d.]+)\s*ms")
-
     hop_numbers: list[int] = []
     timeout_hops: list[int] = []
     max_ms: float | None = None
 
     for line in lines[1:]:  # skip potential header
-        m = hop_re.match(line)
+        m = _HOP_RE.match(line)
         if not m:
             continue
         hop = int(m.group(1))
@@ -251,7 +714,7 @@ def build_traceroute_summary(lines: list[str]) -> str | None:
         if "*" in line:
             timeout_hops.append(hop)
 
-        for ms_match in ms_re.finditer(line):
+        for ms_match in _MS_RE.finditer(line):
             try:
                 val = float(ms_match.group(1))
             except ValueError:
@@ -275,7 +738,7 @@ def build_traceroute_summary(lines: list[str]) -> str | None:
     return tr("TRACE_FINAL_SUMMARY", hops=hops, max_ms=max_ms, timeout_info=timeout_info)
 
 
-def build_traceroute_table(lines: list[str]) -> list[str]:
+def build_traceroute_table(lines) -> list[str]:
     """Format traceroute output as a simple table: one line per hop.
 
     Columns: Hop | Host/IP | RTTs (min/avg/max or timeout).
@@ -283,18 +746,12 @@ def build_traceroute_table(lines: list[str]) -> list[str]:
     if not lines:
         return []
 
-    hop_re = re.compile(r"^\s*(\d+)\s+")
-    ms_re = re.compile(r"([\d.]+)\s*ms")
-
-    rows: list[str] = []
-
     # Header row
-    header = f"{'Hop':>3}  {'Host / IP':<40}  RTTs (ms)"
-    rows.append(header)
+    rows: list[str] = [TRACEROUTE_TABLE_HEADER]
 
     # Parse each hop line
     for line in lines:
-        m = hop_re.match(line)
+        m = _HOP_RE.match(line)
         if not m:
             continue
         hop = int(m.group(1))
@@ -319,7 +776,7 @@ def build_traceroute_table(lines: list[str]) -> list[str]:
             host_ip = f"{host} ({ip})"
 
         rtts: list[float] = []
-        for ms_match in ms_re.finditer(line):
+        for ms_match in _MS_RE.finditer(line):
             try:
                 val = float(ms_match.group(1))
             except ValueError:
@@ -341,34 +798,52 @@ def build_traceroute_table(lines: list[str]) -> list[str]:
 
 
 def traceroute_worker(state: MonitorState):
+    """Run one traceroute unless one is already running.
+
+    state.traceroute_event is set for the duration of the run and always
+    cleared afterwards, even if the run fails unexpectedly.
+    """
+    if state.traceroute_event.is_set():
+        return
+    state.traceroute_event.set()
+    try:
+        run_traceroute(state)
+    finally:
+        # Drop T presses made during the run, then mark it finished. In this
+        # order a press after the clear below is never lost: it already sees
+        # the event clear, so its trigger survives to start the next run.
+        state.traceroute_trigger.clear()
+        state.traceroute_event.clear()
+        state.changed.set()
+
+
+def run_traceroute(state: MonitorState):
     """Run traceroute and stream output lines into state.traceroute_lines.
 
     This gives the user ongoing feedback while traceroute is in progress.
     """
     with state.lock:
-        if state.traceroute_running:
-            return
-        state.traceroute_running = True
         state.last_traceroute_error = None
-        state.traceroute_lines = []
+        state.traceroute_lines = ()
         state.traceroute_summary = None
+        state._trace_cache = (None, None)
         # Record start time for this run
         state.last_traceroute_ts = time.time()
-        host = state.target_host
+        host = state.target_addr
+        state.changed.set()
     try:
-        # Use Popen so we can stream output line by line.
+        # Use Popen so we can stream output as it arrives. The pipe is read
+        # as raw bytes from a non-blocking fd (see below).
         proc = subprocess.Popen(
             ["traceroute", host],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
+            bufsize=0,
         )
     except Exception as e:
         with state.lock:
-            state.traceroute_lines = []
+            state.traceroute_lines = ()
             state.last_traceroute_error = f"Error starting traceroute: {e!r}"
-            state.traceroute_running = False
         return
 
     lines = []
@@ -377,18 +852,44 @@ def traceroute_worker(state: MonitorState):
 
     try:
         assert proc.stdout is not None
-        for line in proc.stdout:
-            line = line.rstrip("\n")
-            lines.append(line)
-            with state.lock:
-                state.traceroute_lines = list(lines)
+        fd = proc.stdout.fileno()
+        os.set_blocking(fd, False)
+        pending = b""
 
+        while True:
             # Enforce an overall timeout so traceroute cannot hang forever.
+            # Checked every second even while a hop produces no output.
             if time.time() - start_time > 300:
                 proc.kill()
                 error_msg = "traceroute timed out after 300 seconds"
                 break
 
+            readable, _, _ = select.select([fd], [], [], 1.0)
+            if not readable:
+                continue
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                continue
+
+            if not chunk:
+                # EOF: keep a trailing line that had no newline (published
+                # together with the final result below)
+                if pending:
+                    lines.append(pending.decode("utf-8", "replace").rstrip("\r"))
+                break
+
+            complete, pending = split_output_lines(pending, chunk)
+            if not complete:
+                continue
+            lines.extend(complete)
+            # Copy-on-swap: build the immutable view outside the lock, once per
+            # chunk, and only swap the reference while holding it
+            published = tuple(lines)
+            with state.lock:
+                state.traceroute_lines = published
+                state.changed.set()
+
         # Wait for process to exit (short timeout just for cleanup)
         try:
             retcode = proc.wait(timeout=5)
@@ -401,15 +902,30 @@ def traceroute_worker(state: MonitorState):
         error_msg = f"Error running traceroute: {e!r}"
 
     summary = build_traceroute_summary(lines) if error_msg is None else None
+    published = tuple(lines)
 
     with state.lock:
-        state.traceroute_lines = lines
+        state.traceroute_lines = published
         state.last_traceroute_error = error_msg
-        state.traceroute_running = False
         state.traceroute_summary = summary
         state.last_traceroute_ts = time.time()
 
 
+def traceroute_worker_loop(state: MonitorState):
+    """Persistent traceroute thread: run once each time the trigger is set.
+
+    Presses of T while a run is in progress are ignored (see
+    request_traceroute and traceroute_worker), matching the "if not already
+    running" rule.
+    """
+    while True:
+        state.traceroute_trigger.wait()
+        with state.lock:
+            if not state.running:
+                break
+        traceroute_worker(state)
+
+
 # Short loss window used for alerts (in checks)
 SHORT_WINDOW_SIZE = 10     # ~10 seconds at 1s interval
 
@@ -424,150 +940,211 @@ def format_ping_value(ms):
     """
     if ms is None:
         return "-"
+    # Fast path: every RTT we track is already a float
+    if type(ms) is float:
+        return ">999" if ms > 999.0 else f"{ms:.1f}"
     try:
         value = float(ms)
     except Exception:
         return str(ms)
-    if value > 999.0:
-        return ">999"
-    return f"{value:.1f}"
-
-
+    return ">999" if value > 999.0 else f"{value:.1f}"
 
 
-def percentile(values: list[float], pct: float) -> float | None:
-    """Return an approximate percentile from a list of numeric values.
+def percentiles(values: list[float], pcts) -> tuple:
+    """Return an approximate percentile of `values` for each entry of `pcts`.
 
     Uses a simple rank-based approach and is intended for small sample sizes.
+    `values` is sorted only once for all percentiles.
     """
     if not values:
-        return None
-    if pct <= 0:
-        return min(values)
-    if pct >= 100:
-        return max(values)
+        return tuple(None for _ in pcts)
 
     sorted_vals = sorted(values)
     n = len(sorted_vals)
-    # Rank in [0, n-1]
-    rank = int(round((pct / 100.0) * (n - 1)))
-    rank = max(0, min(n - 1, rank))
-    return sorted_vals[rank]
+    result = []
+    for pct in pcts:
+        # Rank in [0, n-1]
+        rank = int(round((pct / 100.0) * (n - 1)))
+        rank = max(0, min(n - 1, rank))
+        result.append(sorted_vals[rank])
+    return tuple(result)
+
 
+def compute_multi_window_stats(stats: RollingPingStats, window_sizes) -> list:
+    """Compute recent loss and ping statistics for each of `window_sizes`.
 
+    Each result is (recent_loss_pct, recent_avg_ping_ms, recent_count,
+    recent_lost, recent_min_ping_ms, recent_max_ping_ms) over the last
+    `window_size` checks. Recent jitter is not windowed; see
+    MonitorState.jitter_ewma.
 
-def compute_recent_stats(ping_history, window_size):
+    Reads the aggregates kept by ping_worker in a single pass, so the cost
+    does not depend on the window sizes. Call with state.lock held.
     """
-    Compute recent packet loss and ping statistics over the last `window_size` checks.
-    Returns (recent_loss_pct, recent_avg_ping_ms, recent_count, recent_lost,
-             recent_min_ping_ms, recent_max_ping_ms, jitter_ms).
+    return stats.windows(max(0, size) for size in window_sizes)
+
 
-    Jitter here is a simple average of the absolute difference between
-    consecutive successful pings inside the window.
+def publish_snapshot(state: MonitorState):
+    """Build and publish a new Snapshot of `state`, then mark the screen dirty.
+
+    state.lock is held only to copy the raw fields (ui_lock for the UI-only
+    ones, window_size included); the traceroute table and percentiles are
+    derived outside it. snapshot_lock serializes publishers
+    (aggregator_worker and key handling in main) so an older snapshot never
+    replaces a newer one. Replacing the reference is atomic, so readers never
+    see a half-updated snapshot.
     """
-    if window_size <= 0:
-        return 0.0, None, 0, 0, None, None, None
+    with state.snapshot_lock:
+        # UI-only fields are written under ui_lock, so read them (once, and
+        # consistently with each other) under that lock rather than state.lock
+        with state.ui_lock:
+            window_size = state.window_size
+            show_traceroute_full = state.show_traceroute_full
+            traceroute_scroll = state.traceroute_scroll
+        with state.lock:
+            recent_stats, short_stats = compute_multi_window_stats(
+                state.recent_stats, (window_size, SHORT_WINDOW_SIZE)
+            )
+            # Copy only the samples the percentiles need: successful pings for
+            # the session, and just the trailing window slice for "recent".
+            window_successes = state.successful_samples(window_size)
+            session_successes = state.successful_samples(PING_HISTORY_LENGTH)
+            traceroute_lines = state.traceroute_lines  # immutable tuple, no copy needed
+
+            fields = dict(
+                monitoring=state.monitoring,
+                window_size=window_size,
+                last_ping_ms=state.last_ping_ms,
+                total_sent=state.total_sent,
+                total_recv=state.total_recv,
+                traceroute_running=state.traceroute_event.is_set(),
+                traceroute_error=state.last_traceroute_error,
+                traceroute_summary=state.traceroute_summary,
+                last_traceroute_ts=state.last_traceroute_ts,
+                show_traceroute_full=show_traceroute_full,
+                traceroute_scroll=traceroute_scroll,
+                show_controls=state.show_controls,
+                total_success=state.total_success,
+                success_rtt_sum=state.success_rtt_sum,
+                min_rtt_all=state.min_rtt_all,
+                max_rtt_all=state.max_rtt_all,
+                jitter_sum_all=state.jitter_sum_all,
+                jitter_count_all=state.jitter_count_all,
+                jitter_ewma=state.jitter_ewma,
+                target_host=state.target_host,
+                recent_stats=recent_stats,
+                short_stats=short_stats,
+            )
+
+        # Format traceroute as table lines (reparse only when the output changed)
+        cached_lines, cached_table = state._trace_cache
+        if cached_lines is traceroute_lines:
+            traceroute_table = cached_table
+        else:
+            traceroute_table = tuple(build_traceroute_table(traceroute_lines))
+            state._trace_cache = (traceroute_lines, traceroute_table)
+
+        # Percentiles for window and session
+        p90_win, p99_win = percentiles(window_successes, (90.0, 99.0))
+        p90_all, p99_all = percentiles(session_successes, (90.0, 99.0))
+
+        state.snapshot = Snapshot(
+            **fields,
+            p90_win=p90_win,
+            p99_win=p99_win,
+            p90_all=p90_all,
+            p99_all=p99_all,
+            traceroute_table=traceroute_table,
+        )
+        state.dirty = True
+        state.events.put(WAKE_REDRAW)
 
-    recent = ping_history[-window_size:]
-    recent_count = len(recent)
-    if recent_count == 0:
-        return 0.0, None, 0, 0, None, None, None
-
-    successes = [v for v in recent if v is not None]
-    recent_sent = recent_count
-    recent_success = len(successes)
-    recent_lost = recent_sent - recent_success
-    recent_loss_pct = (recent_lost / recent_sent) * 100.0 if recent_sent > 0 else 0.0
-    recent_avg_ping = (
-        sum(successes) / recent_success if recent_success > 0 else None
-    )
-    recent_min_ping = min(successes) if recent_success > 0 else None
-    recent_max_ping = max(successes) if recent_success > 0 else None
-
-    # Jitter: average absolute delta between consecutive successful pings
-    if recent_success > 1:
-        deltas = [
-            abs(successes[i] - successes[i - 1])
-            for i in range(1, recent_success)
-        ]
-        jitter_ms = sum(deltas) / len(deltas)
-    else:
-        jitter_ms = None
 
-    return (
-        recent_loss_pct,
-        recent_avg_ping,
-        recent_count,
-        recent_lost,
-        recent_min_ping,
-        recent_max_ping,
-        jitter_ms,
-    )
+def aggregator_worker(state: MonitorState):
+    """Publish a new Snapshot whenever a worker reports a change.
+
+    Keeps traceroute parsing and stats off the UI thread, so draw_ui only
+    lays out the latest snapshot.
+    """
+    while True:
+        state.changed.wait()
+        # Clear first so changes made while publishing trigger another round
+        state.changed.clear()
+        with state.lock:
+            if not state.running:
+                break
+        publish_snapshot(state)
 
 
 def draw_ui(stdscr, state: MonitorState):
-    stdscr.clear()
     max_y, max_x = stdscr.getmaxyx()
-
-    with state.lock:
-        monitoring = state.monitoring
-        last_ping_ms = state.last_ping_ms
-        total_sent = state.total_sent
-        total_recv = state.total_recv
-        ping_history = list(state.ping_history)
-        loss_history = list(state.loss_history)
-        traceroute_lines = list(state.traceroute_lines)
-        traceroute_running = state.traceroute_running
-        traceroute_error = state.last_traceroute_error
-        traceroute_summary = state.traceroute_summary
-        last_traceroute_ts = state.last_traceroute_ts
-        window_size = state.window_size
-        show_traceroute_full = state.show_traceroute_full
-        traceroute_scroll = state.traceroute_scroll
-        show_controls = state.show_controls
-
-        total_success = state.total_success
-        success_rtt_sum = state.success_rtt_sum
-        min_rtt_all = state.min_rtt_all
-        max_rtt_all = state.max_rtt_all
-        jitter_sum_all = state.jitter_sum_all
-        jitter_count_all = state.jitter_count_all
-        target_host = state.target_host
+    ui_static = _UI_STATIC
+
+    # Draw off-screen into a pad and push it to the terminal in one update.
+    # The pad has a spare row so writing the bottom-right cell never raises.
+    pad = state.ui_pad
+    if pad is None or pad.getmaxyx() != (max_y + 1, max_x):
+        pad = state.ui_pad = curses.newpad(max_y + 1, max_x)
+        # Terminal was resized (or first frame): repaint everything once
+        stdscr.clear()
+        stdscr.noutrefresh()
+    else:
+        pad.erase()
+
+    # Layout first: collect (y, text) rows, then emit them in one pass below
+    rows: list[tuple[int, str]] = []
+
+    # No lock needed: the snapshot is immutable and replaced atomically
+    snap = state.snapshot
+
+    monitoring = snap.monitoring
+    window_size = snap.window_size
+    last_ping_ms = snap.last_ping_ms
+    total_sent = snap.total_sent
+    total_recv = snap.total_recv
+    traceroute_table = snap.traceroute_table
+    traceroute_running = snap.traceroute_running
+    traceroute_error = snap.traceroute_error
+    traceroute_summary = snap.traceroute_summary
+    last_traceroute_ts = snap.last_traceroute_ts
+    show_traceroute_full = snap.show_traceroute_full
+    traceroute_scroll = snap.traceroute_scroll
+    show_controls = snap.show_controls
+
+    total_success = snap.total_success
+    success_rtt_sum = snap.success_rtt_sum
+    min_rtt_all = snap.min_rtt_all
+    max_rtt_all = snap.max_rtt_all
+    jitter_sum_all = snap.jitter_sum_all
+    jitter_count_all = snap.jitter_count_all
+    jitter_ms = snap.jitter_ewma
+    target_host = snap.target_host
+
+    recent_stats = snap.recent_stats
+    short_stats = snap.short_stats
 
     # Header (not localized on purpose)
     title = "GMS Monitoring"
-    stdscr.addnstr(0, 0, title[:max_x], max_x)
+    rows.append((0, title))
 
     # Instructions / controls (toggleable)
     if show_controls:
         # Table header: Key | Action (no separate title line)
-        header_line = f"{'Key':<8}{tr('KEYS_ACTION_HEADER')}"
-        stdscr.addnstr(2, 0, header_line[:max_x], max_x)
+        header_line = ui_static["controls_header"]
+        rows.append((2, header_line))
 
         # Individual key rows
-        key_rows = [
-            ("P", tr("KEY_ACTION_P")),
-            ("R", tr("KEY_ACTION_R")),
-            ("T", tr("KEY_ACTION_T")),
-            ("F", tr("KEY_ACTION_F")),
-            ("L", tr("KEY_ACTION_L")),
-            ("K", tr("KEY_ACTION_K")),
-            ("↑/↓", tr("KEY_ACTION_SCROLL")),
-            ("Q", tr("KEY_ACTION_Q")),
-        ]
-
         row_y = 3
-        for key, desc in key_rows:
+        for line in ui_static["key_rows"]:
             if row_y >= max_y:
                 break
-            line = f"{key:<8}{desc}"
-            stdscr.addnstr(row_y, 0, line[:max_x], max_x)
+            rows.append((row_y, line))
             row_y += 1
 
         controls_bottom_y = row_y - 1
     else:
-        hint = tr("CONTROLS_HINT")
-        stdscr.addnstr(2, 0, hint[:max_x], max_x)
+        hint = ui_static["controls_hint"]
+        rows.append((2, hint))
         controls_bottom_y = 2
 
     # Top info table: status, ping now, quality, and window
@@ -588,7 +1165,7 @@ def draw_ui(stdscr, state: MonitorState):
         if top_row_y >= max_y:
             return
         line = f"{label:<{label_width}} {value}"
-        stdscr.addnstr(top_row_y, 0, line[:max_x], max_x)
+        rows.append((top_row_y, line))
         top_row_y += 1
 
     # Status row
@@ -609,17 +1186,11 @@ def draw_ui(stdscr, state: MonitorState):
         recent_lost,
         recent_min_ping,
         recent_max_ping,
-        jitter_ms,
-    ) = compute_recent_stats(ping_history, window_size)
+    ) = recent_stats
 
     # Percentiles for window and session
-    window_successes = [v for v in ping_history[-window_size:] if v is not None]
-    session_successes = [v for v in ping_history if v is not None]
-
-    p90_win = percentile(window_successes, 90.0) if window_successes else None
-    p99_win = percentile(window_successes, 99.0) if window_successes else None
-    p90_all = percentile(session_successes, 90.0) if session_successes else None
-    p99_all = percentile(session_successes, 99.0) if session_successes else None
+    p90_win, p99_win = snap.p90_win, snap.p99_win
+    p90_all, p99_all = snap.p90_all, snap.p99_all
 
     # Derive quality label from recent stats
     quality_label = tr("QUALITY_UNKNOWN")
@@ -659,8 +1230,7 @@ def draw_ui(stdscr, state: MonitorState):
     metrics_start_y = top_row_y + 1
 
     if metrics_start_y < max_y:
-        header = f"{'Metric':<14} {'Window (recent)':<18} {'Session (all)':<18}"
-        stdscr.addnstr(metrics_start_y, 0, header[:max_x], max_x)
+        rows.append((metrics_start_y, METRICS_TABLE_HEADER))
 
     row_y = metrics_start_y + 1
 
@@ -669,7 +1239,7 @@ def draw_ui(stdscr, state: MonitorState):
         if row_y >= max_y:
             return
         line = f"{label:<14} {win:<18.18} {all_:<18.18}"
-        stdscr.addnstr(row_y, 0, line[:max_x], max_x)
+        rows.append((row_y, line))
         row_y += 1
 
     # Loss row
@@ -740,9 +1310,7 @@ def draw_ui(stdscr, state: MonitorState):
     table_bottom_y = row_y
 
     # Compute short-term stats for alerts
-    short_loss_pct, short_avg_ping, short_count, short_lost, short_min_ping, short_max_ping, _ = compute_recent_stats(
-        ping_history, SHORT_WINDOW_SIZE
-    )
+    short_loss_pct, short_avg_ping, short_count, short_lost, short_min_ping, short_max_ping = short_stats
 
     # Leave one blank line between metrics and alerts/traceroute
     extras_start_y = table_bottom_y + 1
@@ -768,7 +1336,7 @@ def draw_ui(stdscr, state: MonitorState):
             alert_text = tr("ALERT_HIGH_LOSS")
 
         if alert_text:
-            stdscr.addnstr(alert_y, 0, alert_text[:max_x], max_x)
+            rows.append((alert_y, alert_text))
             alert_y += 1
 
     # Traceroute section
@@ -795,12 +1363,12 @@ def draw_ui(stdscr, state: MonitorState):
         else:
             tr_header = header_base
 
-        stdscr.addnstr(traceroute_header_y, 0, tr_header[:max_x], max_x)
+        rows.append((traceroute_header_y, tr_header))
 
     # Optional final summary (after traceroute completes)
     summary_y = traceroute_header_y + 1
     if (not traceroute_running) and traceroute_summary and summary_y < max_y:
-        stdscr.addnstr(summary_y, 0, traceroute_summary[:max_x], max_x)
+        rows.append((summary_y, traceroute_summary))
         start_y = summary_y + 1
     else:
         start_y = summary_y
@@ -808,8 +1376,8 @@ def draw_ui(stdscr, state: MonitorState):
     if start_y < max_y:
         available_lines = max_y - start_y
 
-        # Format traceroute as table lines
-        table_lines = build_traceroute_table(traceroute_lines)
+        # Traceroute table lines, formatted by publish_snapshot
+        table_lines = traceroute_table
 
         if not table_lines:
             base_lines = []
@@ -830,32 +1398,198 @@ def draw_ui(stdscr, state: MonitorState):
                     base_lines.append(tr("TRACE_SUMMARY_HINT"))
                     base_lines.extend(body[-3:])
 
-        # Apply scroll only when in full mode and there are more lines than we can show
+        # Apply scroll only when in full mode and there are more lines than we can show.
+        # The key handlers clamp to traceroute_max_scroll; the min() only covers
+        # a table or terminal that shrank since the last key press.
         if show_traceroute_full and len(base_lines) > available_lines:
-            max_offset = max(0, len(base_lines) - available_lines)
-            offset = max(0, min(traceroute_scroll, max_offset))
+            max_offset = len(base_lines) - available_lines
+            offset = min(traceroute_scroll, max_offset)
         else:
+            max_offset = 0
             offset = 0
+        state.traceroute_max_scroll = max_offset
 
         visible_lines = base_lines[offset: offset + available_lines]
 
         for i, line in enumerate(visible_lines):
-            stdscr.addnstr(start_y + i, 0, line[:max_x], max_x)
+            rows.append((start_y + i, line))
 
         # If there was an error, show it at the bottom
         if traceroute_error and available_lines > len(visible_lines):
             y = start_y + len(visible_lines)
             if y < max_y:
                 err_text = tr("TRACE_ERROR_PREFIX", error=traceroute_error)
-                stdscr.addnstr(y, 0, err_text[:max_x], max_x)
+                rows.append((y, err_text))
 
-    stdscr.refresh()
+    for y, text in rows:
+        if y < max_y:
+            pad.addnstr(y, 0, text, max_x)
+
+    pad.noutrefresh(0, 0, 0, 0, max_y - 1, max_x - 1)
+    curses.doupdate()
+
+
+def change_language(state: MonitorState):
+    """Load the next language (executor thread) and ask main to apply it."""
+    with state.ui_lock:
+        lang = state.language
+    lang = next_language(lang)
+    # File I/O happens here; the main thread then hits _LANG_CACHE
+    get_language_strings(lang)
+    with state.ui_lock:
+        state.language = lang
+        state.language_version += 1
+    publish_snapshot(state)
+
+
+def scroll_traceroute(state: MonitorState, delta: int):
+    """Move the traceroute scroll offset by `delta` lines.
+
+    The result is clamped to 0..traceroute_max_scroll (as of the last frame),
+    so holding the down key past the end does not build up hidden offset.
+    """
+    with state.ui_lock:
+        new_scroll = min(state.traceroute_scroll + delta, state.traceroute_max_scroll)
+        state.traceroute_scroll = max(0, new_scroll)
+
+
+def quit_monitor(state: MonitorState) -> bool:
+    """Stop all workers. Returns False so the main loop exits."""
+    with state.lock:
+        state.running = False
+        ping_proc = state.ping_proc
+    # Kill ping right away: while the target is unreachable ping prints
+    # nothing, so it would never notice the closed pipe and keep running
+    if ping_proc is not None:
+        stop_ping_process(ping_proc)
+    # Wake the aggregator so it sees running == False and exits
+    state.changed.set()
+    return False
+
+
+def pause_monitoring(state: MonitorState):
+    with state.lock:
+        state.monitoring = False
+
+
+def resume_monitoring(state: MonitorState):
+    with state.lock:
+        state.monitoring = True
+
+
+def request_traceroute(state: MonitorState):
+    # Rerun traceroute (ignored while one is already running)
+    if not state.traceroute_event.is_set():
+        state.traceroute_trigger.set()
+
+
+def toggle_traceroute_full(state: MonitorState):
+    # Toggle traceroute full/summary view
+    with state.ui_lock:
+        state.show_traceroute_full = not state.show_traceroute_full
+        state.traceroute_scroll = 0
+
+
+def request_language_change(state: MonitorState):
+    # Toggle language (e.g. en <-> id); loading runs off the main thread
+    state.executor.submit(change_language, state)
+
+
+def toggle_controls(state: MonitorState):
+    # Toggle visibility of controls / keys guide. Only this thread
+    # writes it and a bool store is atomic, so no lock is needed.
+    state.show_controls = not state.show_controls
+
+
+# Increase / decrease time window (available to all users).
+# Only the load and the store are locked; the clamp runs outside.
+def grow_window(state: MonitorState):
+    with state.ui_lock:
+        cur = state.window_size
+    new_size = min(cur + 10, PING_HISTORY_LENGTH)
+    with state.ui_lock:
+        state.window_size = new_size
+
+
+def shrink_window(state: MonitorState):
+    with state.ui_lock:
+        cur = state.window_size
+    new_size = max(cur - 10, MIN_WINDOW_SIZE)
+    with state.ui_lock:
+        state.window_size = new_size
+
+
+# Key code -> handler. A handler returns False to quit; anything else
+# (normally None) keeps the main loop running. KEY_UP/KEY_DOWN are not
+# listed: main sums each run of them and calls scroll_traceroute once.
+KEY_HANDLERS = {
+    ord("q"): quit_monitor,
+    ord("Q"): quit_monitor,
+    ord("p"): pause_monitoring,
+    ord("P"): pause_monitoring,
+    ord("r"): resume_monitoring,
+    ord("R"): resume_monitoring,
+    ord("t"): request_traceroute,
+    ord("T"): request_traceroute,
+    ord("f"): toggle_traceroute_full,
+    ord("F"): toggle_traceroute_full,
+    ord("l"): request_language_change,
+    ord("L"): request_language_change,
+    ord("k"): toggle_controls,
+    ord("K"): toggle_controls,
+    ord("+"): grow_window,
+    ord("-"): shrink_window,
+}
+
+
+def handle_key(state: MonitorState, ch: int) -> bool:
+    """Apply one key press to `state`. Returns False when the user quits."""
+    handler = KEY_HANDLERS.get(ch)
+    if handler is None:
+        return True
+    return handler(state) is not False
+
+
+def tune_input_thread():
+    """Best effort: pin the calling thread to CPU 0 and raise its priority.
+
+    On Linux both calls apply to the calling thread only, so the ping and
+    traceroute workers stay free to migrate. Either may be unavailable
+    (non-Linux) or refused (raising priority needs CAP_SYS_NICE); that is
+    fine, the thread then just runs with the defaults.
+    """
+    try:
+        if 0 in os.sched_getaffinity(0):
+            os.sched_setaffinity(0, {0})
+    except (AttributeError, OSError):
+        pass
+    try:
+        os.nice(-5)
+    except (AttributeError, OSError):
+        pass
+
+
+def input_worker(state: MonitorState, fd: int):
+    """Block until keyboard input is pending, then wake the main loop.
+
+    Curses is only ever called from the main thread; this thread just waits
+    on the terminal fd so the main loop can sleep on state.events instead of
+    polling getch. It waits for the main loop to drain the pending keys
+    (state.input_drained) before watching the fd again.
+    """
+    tune_input_thread()
+    while True:
+        state.input_drained.wait()
+        state.input_drained.clear()
+        select.select([fd], [], [])
+        state.events.put(WAKE_INPUT)
 
 
-def main(stdscr, target_host: str):
+def main(stdscr, *, target_host: str, target_addr: str | None = None):
     curses.curs_set(0)
+    # getch never blocks: the main loop only calls it once input_worker has
+    # seen pending input (or on the idle fallback timeout)
     stdscr.nodelay(True)
-    stdscr.timeout(200)  # getch timeout in ms
 
     # Ensure a clean background using the terminal's default colors
     try:
@@ -869,7 +1603,15 @@ def main(stdscr, target_host: str):
     stdscr.clear()
     stdscr.refresh()
 
-    state = MonitorState(target_host)
+    state = MonitorState(target_host, target_addr)
+
+    # Start snapshot aggregator (publishes what the workers below produce)
+    aggregator_thread = threading.Thread(
+        target=aggregator_worker,
+        args=(state,),
+        daemon=True,
+    )
+    aggregator_thread.start()
 
     # Start ping worker
     ping_thread = threading.Thread(
@@ -879,87 +1621,118 @@ def main(stdscr, target_host: str):
     )
     ping_thread.start()
 
-    # Start initial traceroute
+    # Start traceroute worker and request the initial run
     traceroute_thread = threading.Thread(
-        target=traceroute_worker,
+        target=traceroute_worker_loop,
         args=(state,),
         daemon=True,
     )
     traceroute_thread.start()
+    state.traceroute_trigger.set()
 
-    while True:
-        draw_ui(stdscr, state)
-
-        try:
-            ch = stdscr.getch()
-        except KeyboardInterrupt:
-            ch = ord("q")
-
-        if ch == -1:
-            continue
-
-        if ch in (ord("q"), ord("Q")):
-            with state.lock:
-                state.running = False
-            break
-
-        elif ch in (ord("p"), ord("P")):
-            with state.lock:
-                state.monitoring = False
-
-        elif ch in (ord("r"), ord("R")):
-            with state.lock:
-                state.monitoring = True
+    # Start input watcher (wakes the main loop when keys are pending)
+    input_thread = threading.Thread(
+        target=input_worker,
+        args=(state, sys.stdin.fileno()),
+        daemon=True,
+    )
+    input_thread.start()
 
-        elif ch in (ord("t"), ord("T")):
-            # Rerun traceroute if not already running
-            with state.lock:
-                already_running = state.traceroute_running
-            if not already_running:
-                t = threading.Thread(
-                    target=traceroute_worker,
-                    args=(state,),
-                    daemon=True,
-                )
-                t.start()
-
-        elif ch in (ord("f"), ord("F")):
-            # Toggle traceroute full/summary view
-            with state.lock:
-                state.show_traceroute_full = not state.show_traceroute_full
-                state.traceroute_scroll = 0
+    # Whatever ends the loop (q, Ctrl-C, or an exception such as a curses
+    # error while drawing), stop the workers and kill the ping child: an
+    # unreachable target makes ping silent, so it would never get SIGPIPE.
+    try:
+        language_version = 0
+        while True:
+            if state.dirty:
+                # Clear first so changes made while drawing trigger another frame
+                state.dirty = False
+                with state.ui_lock:
+                    if state.language_version != language_version:
+                        language_version = state.language_version
+                        # Strings are already cached by change_language
+                        set_language(state.language)
+                draw_ui(stdscr, state)
+
+            # Sleep until there is input or a new snapshot. The timeout is only a
+            # fallback for KEY_RESIZE, which arrives by signal rather than stdin.
+            try:
+                event = state.events.get(timeout=UI_IDLE_TIMEOUT_SECONDS)
+            except queue.Empty:
+                event = None
+            except KeyboardInterrupt:
+                break
 
-        elif ch in (curses.KEY_UP,):
-            # Scroll traceroute up when there is more content (affects full mode)
-            with state.lock:
-                state.traceroute_scroll = max(0, state.traceroute_scroll - 1)
+            if event == WAKE_REDRAW:
+                continue
 
-        elif ch in (curses.KEY_DOWN,):
-            # Scroll traceroute down when there is more content (affects full mode)
-            with state.lock:
-                state.traceroute_scroll += 1
+            # Drain every key curses has buffered (getch does not block here).
+            # Runs of arrow keys (e.g. auto-repeat) are summed and applied with
+            # a single lock acquisition.
+            keep_running = True
+            handled = False
+            scroll_delta = 0
+            while keep_running:
+                try:
+                    ch = stdscr.getch()
+                except KeyboardInterrupt:
+                    ch = ord("q")
+                if ch == -1:
+                    break
+                handled = True
+                if ch == curses.KEY_UP:
+                    scroll_delta -= 1
+                    continue
+                if ch == curses.KEY_DOWN:
+                    scroll_delta += 1
+                    continue
+                if scroll_delta:
+                    # Apply pending scrolling before a key that may reset it (f)
+                    scroll_traceroute(state, scroll_delta)
+                    scroll_delta = 0
+                keep_running = handle_key(state, ch)
+            if scroll_delta:
+                scroll_traceroute(state, scroll_delta)
+
+            if not keep_running:
+                break
+            if event == WAKE_INPUT:
+                state.input_drained.set()
+            if handled:
+                # Any key (including KEY_RESIZE) may change what is on screen.
+                # Publish right away so the next frame reflects it.
+                publish_snapshot(state)
+    finally:
+        quit_monitor(state)
+        state.executor.shutdown(wait=False, cancel_futures=True)
+        # ping_worker is a daemon thread; let it finish its cleanup before exit
+        ping_thread.join(timeout=PING_INTERVAL_SECONDS + 1.0)
+
+
+class LangAction(argparse.Action):
+    """Load the chosen language's strings while the arguments are parsed.
+
+    argparse has already checked `choices`, so set_language() at startup
+    only switches to the cached strings.
+    """
 
-        elif ch in (ord("l"), ord("L")):
-            # Toggle language (e.g. en <-> id)
-            cycle_language()
+    def __call__(self, parser, namespace, values, option_string=None):
+        get_language_strings(values)
+        setattr(namespace, self.dest, values)
 
-        elif ch in (ord("k"), ord("K")):
-            # Toggle visibility of controls / keys guide
-            with state.lock:
-                state.show_controls = not state.show_controls
 
-        # Increase / decrease time window (available to all users)
-        elif ch == ord('+'):
-            with state.lock:
-                new_size = state.window_size + 10
-                state.window_size = min(new_size, PING_HISTORY_LENGTH)
+def resolve_host(host: str) -> str:
+    """Resolve `host` to an IPv4 address once, or return it unchanged.
 
-        elif ch == ord('-'):
-            with state.lock:
-                new_size = state.window_size - 10
-                if new_size < MIN_WINDOW_SIZE:
-                    new_size = MIN_WINDOW_SIZE
-                state.window_size = new_size
+    ping is restarted on resume and traceroute runs on demand; passing them
+    the address avoids a DNS lookup for every restart. The host name is
+    still what the UI shows.
+    """
+    try:
+        return socket.gethostbyname(host)
+    except (OSError, UnicodeError):
+        # Unresolvable for now (or IPv6 only): let ping/traceroute resolve it
+        return host
 
 
 if __name__ == "__main__":
@@ -970,6 +1743,7 @@ if __name__ == "__main__":
         "--lang",
         default="en",
         choices=SUPPORTED_LANGS,
+        action=LangAction,
         help="language code (e.g. en, id)",
     )
     parser.add_argument(
@@ -980,4 +1754,6 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     set_language(args.lang)
-    curses.wrapper(lambda stdscr: main(stdscr, target_host=args.host))
+    curses.wrapper(
+        partial(main, target_host=args.host, target_addr=resolve_host(args.host))
+    )
@@ -0,0 +1,58 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gms_monitor import ICMP_SEQ_MODULUS, account_ping_reply, parse_ping_line
+
+
+def test_parse_linux_reply():
+    line = "64 bytes from 1.2.3.4: icmp_seq=7 ttl=57 time=10.1 ms"
+    assert parse_ping_line(line) == (7, 10.1)
+
+
+def test_parse_macos_timeout():
+    assert parse_ping_line("Request timeout for icmp_seq 5") == (5, None)
+
+
+def test_parse_ignores_other_lines():
+    assert parse_ping_line("PING host (1.2.3.4) 56(84) bytes of data.") is None
+
+
+def test_gap_counts_losses():
+    results, next_seq = account_ping_reply(1, 4, 12.0)
+    assert results == [(False, None), (False, None), (False, None), (True, 12.0)]
+    assert next_seq == 5
+
+
+def test_late_reply_is_dropped():
+    results, next_seq = account_ping_reply(10, 8, 5.0)
+    assert results == []
+    assert next_seq == 10
+
+
+def test_sequence_wraps():
+    next_seq = ICMP_SEQ_MODULUS - 2
+    recorded = []
+    for seq in (ICMP_SEQ_MODULUS - 2, ICMP_SEQ_MODULUS - 1, 0, 1, 3):
+        results, next_seq = account_ping_reply(next_seq, seq, 1.0)
+        recorded.extend(results)
+    assert recorded.count((True, 1.0)) == 5
+    assert recorded.count((False, None)) == 1
+    assert next_seq == 4
+
+
+def test_late_reply_across_wrap_is_dropped():
+    results, next_seq = account_ping_reply(1, ICMP_SEQ_MODULUS - 1, 1.0)
+    assert results == []
+    assert next_seq == 1
+
+
+def test_parse_busybox_reply():
+    line = "64 bytes from 1.2.3.4: seq=3 ttl=57 time=9.5 ms"
+    assert parse_ping_line(line) == (3, 9.5)
+
+
+def test_reply_without_sequence_is_a_plain_sample():
+    assert parse_ping_line("reply from 1.2.3.4: time=4.0 ms") == (None, 4.0)
+    assert account_ping_reply(7, None, 4.0) == ([(True, 4.0)], 7)
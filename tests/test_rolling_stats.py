@@ -0,0 +1,115 @@
+import math
+import os
+import random
+import sys
+from collections import deque
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gms_monitor import PING_HISTORY_LENGTH, MonitorState, RollingPingStats
+
+WINDOW_SIZES = (0, 1, 10, 60, PING_HISTORY_LENGTH - 1, PING_HISTORY_LENGTH, 1000)
+
+
+def brute_force_window(history, size):
+    """Reference for RollingPingStats.windows(): scan the raw samples."""
+    recent = list(history)[-size:] if size > 0 else []
+    n = len(recent)
+    if n == 0:
+        return (0.0, None, 0, 0, None, None)
+    successes = [v for v in recent if v is not None]
+    lost = n - len(successes)
+    loss_pct = (lost / n) * 100.0
+    if not successes:
+        return (loss_pct, None, n, lost, None, None)
+    avg = sum(successes) / len(successes)
+    return (loss_pct, avg, n, lost, min(successes), max(successes))
+
+
+def random_history(seed, length, loss_rate=0.2):
+    rng = random.Random(seed)
+    return [
+        None if rng.random() < loss_rate else round(rng.uniform(1.0, 300.0), 1)
+        for _ in range(length)
+    ]
+
+
+def assert_windows_match(stats, history):
+    for size, got in zip(WINDOW_SIZES, stats.windows(WINDOW_SIZES)):
+        expected = brute_force_window(history, size)
+        assert got[0] == pytest.approx(expected[0])
+        assert got[2:] == expected[2:]
+        if expected[1] is None:
+            assert got[1] is None
+        else:
+            assert got[1] == pytest.approx(expected[1])
+
+
+@pytest.mark.parametrize("length", [0, 5, 59, PING_HISTORY_LENGTH, 3 * PING_HISTORY_LENGTH + 7])
+def test_windows_match_brute_force(length):
+    stats = RollingPingStats(PING_HISTORY_LENGTH)
+    history = deque(maxlen=PING_HISTORY_LENGTH)
+    for rtt in random_history(length, length):
+        stats.append(rtt)
+        history.append(rtt)
+    assert_windows_match(stats, history)
+
+
+def test_windows_match_after_every_append():
+    stats = RollingPingStats(PING_HISTORY_LENGTH)
+    history = deque(maxlen=PING_HISTORY_LENGTH)
+    for rtt in random_history(1, 2 * PING_HISTORY_LENGTH + 13, loss_rate=0.5):
+        stats.append(rtt)
+        history.append(rtt)
+        assert_windows_match(stats, history)
+
+
+def test_window_with_every_packet_lost():
+    stats = RollingPingStats(PING_HISTORY_LENGTH)
+    history = deque(maxlen=PING_HISTORY_LENGTH)
+    # Successes first, then an outage longer than the short windows
+    for rtt in [5.0] * 50 + [None] * 80:
+        stats.append(rtt)
+        history.append(rtt)
+    assert stats.windows((60,))[0] == (100.0, None, 60, 60, None, None)
+    assert_windows_match(stats, history)
+
+
+def test_window_larger_than_history():
+    stats = RollingPingStats(PING_HISTORY_LENGTH)
+    for rtt in (10.0, None, 30.0):
+        stats.append(rtt)
+    loss_pct, avg, n, lost, min_rtt, max_rtt = stats.windows((60,))[0]
+    assert (n, lost, min_rtt, max_rtt) == (3, 1, 10.0, 30.0)
+    assert loss_pct == pytest.approx(100.0 / 3)
+    assert avg == pytest.approx(20.0)
+
+
+def as_samples(values):
+    """Convert NaN-for-lost buffer values back to None-for-lost."""
+    return [None if math.isnan(v) else v for v in values]
+
+
+@pytest.mark.parametrize("length", [0, 7, PING_HISTORY_LENGTH, 2 * PING_HISTORY_LENGTH + 31])
+def test_ring_buffer_matches_brute_force(length):
+    state = MonitorState("example.com")
+    history = deque(maxlen=PING_HISTORY_LENGTH)
+    for rtt in random_history(length + 100, length):
+        state.append_sample(rtt)
+        history.append(rtt)
+    for count in WINDOW_SIZES:
+        expected = list(history)[-count:] if count > 0 else []
+        assert as_samples(state.recent_samples(count)) == expected
+        assert state.successful_samples(count) == tuple(
+            v for v in expected if v is not None
+        )
+
+
+def test_ring_buffer_all_lost():
+    state = MonitorState("example.com")
+    for _ in range(PING_HISTORY_LENGTH + 5):
+        state.append_sample(None)
+    assert as_samples(state.recent_samples(60)) == [None] * 60
+    assert state.successful_samples(60) == ()